@@ -14,8 +14,11 @@ class COLMAP_PREP_OT_apply_modifier(Operator):
     def execute(self, context):
         # Ensure the geometry node group exists
         node_group = create_geometry_node_setup()
+        image_identifier = node_group.nodes['Group Input'].outputs['Image'].identifier
         
         applied_count = 0
+        # Materials are often shared; resolve each one's image only once
+        material_images = {}
         
         for obj in context.selected_objects:
             if obj.type != 'MESH':
@@ -40,11 +43,12 @@ class COLMAP_PREP_OT_apply_modifier(Operator):
             if obj.data.materials:
                 for material in obj.data.materials:
                     if material:
-                        image = get_image_from_material(material)
+                        if material.name_full not in material_images:
+                            material_images[material.name_full] = get_image_from_material(material)
+                        image = material_images[material.name_full]
                         if image:
                             break
             
-            image_identifier = modifier.node_group.nodes['Group Input'].outputs['Image'].identifier
             # Set the image input if found
             if image and image_identifier in modifier:
                 modifier[image_identifier] = image
@@ -1,12 +1,24 @@
 import bpy
-import mathutils
 from pathlib import Path
 from bpy_extras.io_utils import ExportHelper
-from bpy.props import StringProperty, BoolProperty, EnumProperty
-from .. utils.create_point3d import create_point3d_from_mesh
-from .. utils.read_write_model import write_model, Camera, Image
+from bpy.props import StringProperty, BoolProperty, EnumProperty, IntProperty
+from .. utils.create_point3d import read_point_attributes, build_point3d_soa
+from .. utils.read_write_model import write_model, rotmats2qvecs, Camera, Image, Point3DSoA
+from .. utils.background_render import render_in_background
+from .. utils.downsample import HAS_PILLOW, downsample_pyramid, is_up_to_date
 import numpy as np
-import glob
+import os
+from concurrent.futures import ThreadPoolExecutor
+from itertools import groupby
+from operator import itemgetter
+
+# Geometry node groups whose name starts with this prefix are treated as
+# viewport helpers and are switched off while the dataset is rendered.
+HELPER_NODE_GROUP_PREFIX = "COLMAP_Helper"
+
+# Blender cameras look down -Z with +Y up while COLMAP cameras look down +Z
+# with +Y down, so the camera's Y and Z axes are flipped.
+BLENDER_TO_COLMAP_CAMERA = np.diag([1.0, -1.0, -1.0])
 
 class BlenderExporterForColmap(bpy.types.Operator, ExportHelper):
 
@@ -44,6 +56,15 @@ class BlenderExporterForColmap(bpy.types.Operator, ExportHelper):
         default='OPENCV'
     )
 
+    render_workers: IntProperty(
+        name="Render Workers",
+        description="Number of background Blender processes rendering in parallel. "
+                    "1 renders in the current session",
+        default=1,
+        min=1,
+        max=64
+    )
+
     downsample_images: BoolProperty(
         name="Downsample Images",
         description="Create downsampled versions of the rendered images",
@@ -56,156 +77,182 @@ class BlenderExporterForColmap(bpy.types.Operator, ExportHelper):
         default="2 4 8"
     )
 
-    def get_pc_gen_modifier(self, obj):
-        for mod in obj.modifiers:
-            if mod.node_group.name == "PointCloudGeneration":
-                return mod
-        return None
-
+    def get_pc_gen_modifiers(self):
+        """Map mesh names to their PointCloudGeneration modifier in one pass"""
+        pc_modifiers = {}
+        for obj in bpy.data.objects:
+            if obj.type != 'MESH':
+                continue
+            for mod in obj.modifiers:
+                # Only geometry nodes modifiers have node_group, and it may be None
+                if getattr(getattr(mod, 'node_group', None), 'name', None) == "PointCloudGeneration":
+                    pc_modifiers[obj.name_full] = (obj, mod)
+                    break
+        return pc_modifiers
+
+
+    def get_preview_identifier(self, node_group, cache):
+        """Get the modifier key of the node group's Preview input, or None"""
+        if node_group is None:
+            return None
+        key = node_group.name_full
+        if key not in cache:
+            identifier = None
+            if "Group Input" in node_group.nodes:
+                group_input = node_group.nodes['Group Input']
+                if "Preview" in group_input.outputs:
+                    identifier = group_input.outputs['Preview'].identifier
+            cache[key] = identifier
+        return cache[key]
 
     def get_camera_keyframes(self, camera):
-        """Get all keyframe positions for a camera"""
-        keyframes = set()
+        """Get all keyframe positions for a camera as a sorted array"""
+        frames = [np.empty(0, dtype=np.int32)]
         
         if camera.animation_data and camera.animation_data.action:
             action = camera.animation_data.action
-            for fcurve in action.fcurves:
-                if fcurve.data_path.startswith(('location', 'rotation')):
-                    for keyframe in fcurve.keyframe_points:
-                        keyframes.add(int(keyframe.co[0]))
+            fcurves = [
+                fcurve for fcurve in action.fcurves
+                if fcurve.data_path.startswith(('location', 'rotation'))
+            ]
+            for fcurve in fcurves:
+                co = np.empty(len(fcurve.keyframe_points) * 2, dtype=np.float32)
+                fcurve.keyframe_points.foreach_get('co', co)
+                frames.append(co[0::2].astype(np.int32))
+        
+        keyframes = np.unique(np.concatenate(frames))
         
         # If no keyframes found, use current frame
-        if not keyframes:
-            keyframes.add(bpy.context.scene.frame_current)
+        if keyframes.size == 0:
+            keyframes = np.array([bpy.context.scene.frame_current], dtype=np.int32)
             
-        return sorted(keyframes)
+        return keyframes
 
-    def setup_point_cloud_modifiers(self):
-        """Prepare point cloud modifiers for export"""
+    def setup_point_cloud_modifiers(self, executor):
+        """Prepare point cloud modifiers for export
+
+        Point attributes are read here; converting them to world-space points
+        runs on ``executor``. Returns the modifier states and the futures of
+        the per-mesh point clouds.
+        """
         modifier_states = {}
-        point3ds = []
+        point3d_futures = []
+        preview_identifiers = {}
+        pc_objects = []
         
-        for obj in bpy.data.objects:
-            if obj.type == 'MESH':
-                mod = self.get_pc_gen_modifier(obj)
-                if mod:
-                    # Store original states
-                    modifier_states[obj.name_full] = {
-                        'show_viewport': mod.show_viewport,
-                        'show_render': mod.show_render,
-                        'preview_state': None
-                    }
-                    
-                    # Enable modifier
-                    mod.show_viewport = True
-                    mod.show_render = True
-                    
-                    # Turn off Preview mode
-                    if mod.node_group and "Group Input" in mod.node_group.nodes:
-                        group_input = mod.node_group.nodes['Group Input']
-                        if "Preview" in group_input.outputs:
-                            identifier = group_input.outputs['Preview'].identifier
-                            modifier_states[obj.name_full]['preview_state'] = mod.get(identifier, True)
-                            mod[identifier] = False
-                    
-                    # Enable modifier
-                    mod.show_viewport = True
-                    mod.show_render = True
-                    # Generate point cloud data
-                    original_frame = bpy.context.scene.frame_current
-
-                    bpy.context.scene.frame_set(original_frame + 1)  # Force update
-                    
-                    # Add your point cloud generation logic here
-                    point3ds.extend(create_point3d_from_mesh(obj))
-
-                    mod.show_viewport = False
-                    mod.show_render = False
-                    
-                    bpy.context.scene.frame_set(original_frame)
+        for name, (obj, mod) in self.get_pc_gen_modifiers().items():
+            # Store original states
+            modifier_states[name] = {
+                'modifier': mod,
+                'show_viewport': mod.show_viewport,
+                'show_render': mod.show_render,
+                'preview_identifier': None,
+                'preview_state': None
+            }
+            
+            # Enable modifier
+            mod.show_viewport = True
+            mod.show_render = True
+            
+            # Turn off Preview mode
+            identifier = self.get_preview_identifier(mod.node_group, preview_identifiers)
+            if identifier is not None:
+                modifier_states[name]['preview_identifier'] = identifier
+                modifier_states[name]['preview_state'] = mod.get(identifier, True)
+                mod[identifier] = False
+
+            # Socket values are ID properties and don't tag the
+            # object, so request its re-evaluation explicitly
+            obj.update_tag()
+            pc_objects.append((obj, mod))
+
+        # Evaluate all point cloud meshes in a single depsgraph update
+        if pc_objects:
+            bpy.context.view_layer.update()
+
+        for obj, mod in pc_objects:
+            # Generate point cloud data
+            attributes = read_point_attributes(obj)
+            if attributes is not None:
+                point3d_futures.append(executor.submit(build_point3d_soa, *attributes))
+
+        for obj, mod in pc_objects:
+            mod.show_viewport = False
+            mod.show_render = False
         
-        return modifier_states, point3ds
+        return modifier_states, point3d_futures
     
     def restore_modifier_states(self, modifier_states):
         """Restore original modifier states"""
-        for obj in bpy.data.objects:
-            if obj.type == 'MESH' and obj.name_full in modifier_states:
-                mod = self.get_pc_gen_modifier(obj)
-                if mod:
-                    states = modifier_states[obj.name_full]
-                    mod.show_viewport = states['show_viewport']
-                    mod.show_render = states['show_render']
-                    if states['preview_state'] is not None:
-                        if mod.node_group and "Group Input" in mod.node_group.nodes:
-                            group_input = mod.node_group.nodes['Group Input']
-                            if "Preview" in group_input.outputs:
-                                identifier = group_input.outputs['Preview'].identifier
-                                mod[identifier] = states['preview_state']
-
-    def get_camera_parameters(self, camera, scene):
-        """Extract camera parameters for COLMAP"""
-        width=int(scene.render.resolution_x * scene.render.resolution_percentage / 100.0)
-        height=int(scene.render.resolution_y * scene.render.resolution_percentage / 100.0)
-        
-        # Calculate focal length in pixels
-        focal_length = camera.data.lens
-        sensor_width = camera.data.sensor_width
-        sensor_height = camera.data.sensor_height
+        for states in modifier_states.values():
+            mod = states['modifier']
+            mod.show_viewport = states['show_viewport']
+            mod.show_render = states['show_render']
+            if states['preview_state'] is not None:
+                mod[states['preview_identifier']] = states['preview_state']
+
+    def disable_helper_modifiers(self, scene):
+        """Turn off helper geometry node modifiers while rendering"""
+        helper_states = []
+        for obj in scene.objects:
+            for mod in obj.modifiers:
+                if (mod.type == 'NODES' and mod.node_group
+                        and mod.node_group.name.startswith(HELPER_NODE_GROUP_PREFIX)):
+                    helper_states.append((mod, mod.show_viewport, mod.show_render))
+                    mod.show_viewport = False
+                    mod.show_render = False
+        return helper_states
+
+    def restore_helper_modifiers(self, helper_states):
+        """Restore helper modifiers turned off by disable_helper_modifiers"""
+        for mod, show_viewport, show_render in helper_states:
+            mod.show_viewport = show_viewport
+            mod.show_render = show_render
+
+    def get_camera_parameters(self, cameras, width, height):
+        """Extract camera parameters for COLMAP, one row per camera"""
+        # Calculate focal lengths in pixels for all cameras at once
+        focal_length = np.array([camera.data.lens for camera in cameras])
+        sensor_width = np.array([camera.data.sensor_width for camera in cameras])
+        sensor_height = np.array([camera.data.sensor_height for camera in cameras])
         
         fx = focal_length * width / sensor_width
         fy = focal_length * height / sensor_height
         
         # Principal point (assuming centered)
-        cx = width / 2
-        cy = height / 2
+        cx = np.full(len(cameras), width / 2)
+        cy = np.full(len(cameras), height / 2)
 
         if self.camera_model == 'PINHOLE':
-            return [fx, fy, cx, cy]
+            return np.column_stack([fx, fy, cx, cy])
         elif self.camera_model == 'OPENCV':
             # Distortion parameters (set to 0 for now)
-            k1 = k2 = p1 = p2 = 0
-            return [fx, fy, cx, cy, k1, k2, p1, p2]
+            distortion = np.zeros((len(cameras), 4))
+            return np.column_stack([fx, fy, cx, cy, distortion])
 
-    def get_camera_pose(self, camera):
-        """Get camera pose in COLMAP format"""
-        rotation_mode_backup = camera.rotation_mode
-        camera.rotation_mode = "QUATERNION"
-        
-        cam_rot_orig = mathutils.Quaternion(camera.rotation_quaternion)
-        
-        cam_rot = mathutils.Quaternion((
-            cam_rot_orig.x,
-            cam_rot_orig.w, 
-            cam_rot_orig.z,
-            -cam_rot_orig.y
-        ))
-        
-        # Get translation
-        location = mathutils.Vector(camera.location)
-        translation = -(cam_rot.to_matrix() @ location)
-        
-        # Restore rotation mode
-        camera.rotation_mode = rotation_mode_backup
-        
-        return {
-            'qvec': np.array([cam_rot.w, cam_rot.x, cam_rot.y, cam_rot.z]),
-            'tvec': np.array([translation.x, translation.y, translation.z])
-        }
-
-    def render_camera_at_frame(self, camera, frame, output_path):
-        """Render camera at specific frame"""
-        original_frame = bpy.context.scene.frame_current
-        original_camera = bpy.context.scene.camera
-        
-        try:
-            bpy.context.scene.frame_set(frame)
-            bpy.context.scene.camera = camera
-            bpy.ops.render.render()
-            bpy.data.images['Render Result'].save_render(str(output_path))
-            
-        finally:
-            bpy.context.scene.frame_set(original_frame)
-            bpy.context.scene.camera = original_camera
+    def get_camera_poses(self, matrices):
+        """Get COLMAP poses for an (N, 4, 4) stack of camera world matrices
+
+        Returns (N, 4) qvecs and (N, 3) tvecs of the world-to-camera transforms.
+        """
+        rotation = matrices[:, :3, :3]
+        # Drop any object scale from the rotation columns
+        rotation = rotation / np.linalg.norm(rotation, axis=1, keepdims=True)
+        location = matrices[:, :3, 3]
+
+        world_to_camera = BLENDER_TO_COLMAP_CAMERA @ rotation.transpose(0, 2, 1)
+        tvecs = -np.einsum('nij,nj->ni', world_to_camera, location)
+        return rotmats2qvecs(world_to_camera), tvecs
+
+    def render_camera(self, camera, output_path):
+        """Render camera at the current frame straight to output_path
+
+        Changes the scene camera and output path; export_dataset restores them.
+        """
+        scene = bpy.context.scene
+        scene.camera = camera
+        scene.render.filepath = str(output_path)
+        bpy.ops.render.render(write_still=True)
 
     def export_dataset(self, context, dirpath: Path, format: str):
         scene = context.scene
@@ -220,77 +267,149 @@ class BlenderExporterForColmap(bpy.types.Operator, ExportHelper):
             self.report({'ERROR'}, "No cameras found in scene")
             return {'CANCELLED'}
 
-        modifier_states, point3ds = self.setup_point_cloud_modifiers()
+        point_cloud_executor = ThreadPoolExecutor(max_workers=1)
+        modifier_states, point3d_futures = self.setup_point_cloud_modifiers(point_cloud_executor)
+        helper_states = self.disable_helper_modifiers(scene)
+
+        width = int(scene.render.resolution_x * scene.render.resolution_percentage / 100.0)
+        height = int(scene.render.resolution_y * scene.render.resolution_percentage / 100.0)
+        file_format = scene.render.image_settings.file_format.lower()
+        original_frame = scene.frame_current
+        original_camera = scene.camera
+        original_filepath = scene.render.filepath
+        original_use_file_extension = scene.render.use_file_extension
+        # Renders are written to exactly the paths listed in images.txt/bin
+        scene.render.use_file_extension = False
 
         try:
             cameras = {}
             images = {}
-            total_renders = 0
             current_render = 0
-            modifier_states = {}
-            for camera in scene_cameras:
-                if self.render_keyframes_only:
-                    keyframes = self.get_camera_keyframes(camera)
-                    total_renders += len(keyframes)
-                else:
-                    total_renders += 1
-            
+            if self.render_keyframes_only:
+                frames_by_camera = {
+                    camera.name_full: self.get_camera_keyframes(camera)
+                    for camera in scene_cameras
+                }
+            else:
+                frames_by_camera = {
+                    camera.name_full: [scene.frame_current]
+                    for camera in scene_cameras
+                }
+            total_renders = sum(len(frames) for frames in frames_by_camera.values())
+
+            sorted_cameras = sorted(scene_cameras, key=lambda x: x.name_full)
+            camera_params = self.get_camera_parameters(sorted_cameras, width, height)
+
+            jobs = []
             camera_id = 1
             image_id = 1
-            for camera in sorted(scene_cameras, key=lambda x: x.name_full):
-                params = self.get_camera_parameters(camera, scene)
+            for camera, params in zip(sorted_cameras, camera_params):
                 cameras[camera_id] = Camera(
                     id=camera_id,
                     model=self.camera_model,
-                    width=int(scene.render.resolution_x * scene.render.resolution_percentage / 100.0),
-                    height=int(scene.render.resolution_y * scene.render.resolution_percentage / 100.0),
+                    width=width,
+                    height=height,
                     params=params
                 )
-                if self.render_keyframes_only:
-                    frames_to_render = self.get_camera_keyframes(camera)
-                else:
-                    frames_to_render = [scene.frame_current]
+                frames_to_render = frames_by_camera[camera.name_full]
 
                 for frame in frames_to_render:
-                    original_frame = scene.frame_current
-                    scene.frame_set(frame)
-
-                    pose = self.get_camera_pose(camera)
-
-                    file_format = scene.render.image_settings.file_format.lower()
                     if self.render_keyframes_only and len(frames_to_render) > 1:
                         filename = f"{camera.name_full}_frame_{frame:04d}.{file_format}"
                     else:
                         filename = f"{camera.name_full}.{file_format}"
-                    images[image_id] = Image(
-                        id=image_id,
-                        qvec=pose['qvec'],
-                        tvec=pose['tvec'],
-                        camera_id=camera_id,
-                        name=filename,
-                        xys=[],
-                        point3D_ids=[]
-                    )
+                    jobs.append((int(frame), image_id, camera_id, camera, filename))
+                    image_id += 1
+                
+                camera_id += 1
+
+            # Visit the jobs frame by frame so each frame is evaluated once
+            jobs.sort(key=itemgetter(0))
+            render_jobs = []
+            camera_matrices = []
+            for frame, frame_jobs in groupby(jobs, key=itemgetter(0)):
+                scene.frame_set(frame)
+                for _, image_id, camera_id, camera, filename in frame_jobs:
+                    camera_matrices.append(np.array(camera.matrix_world))
+
                     output_path = images_dir / filename
-                    self.render_camera_at_frame(camera, frame, output_path)
+                    if self.render_workers > 1:
+                        render_jobs.append((camera.name, frame, output_path))
+                    else:
+                        self.render_camera(camera, output_path)
+
+                        current_render += 1
+                        progress = (current_render / total_renders) * 100
+                        context.window_manager.progress_update(progress)
+
+            qvecs, tvecs = self.get_camera_poses(np.stack(camera_matrices))
+            image_entries = sorted(zip(jobs, qvecs, tvecs), key=lambda entry: entry[0][1])
+            for (_, image_id, camera_id, _, filename), qvec, tvec in image_entries:
+                images[image_id] = Image(
+                    id=image_id,
+                    qvec=qvec,
+                    tvec=tvec,
+                    camera_id=camera_id,
+                    name=filename,
+                    xys=[],
+                    point3D_ids=[]
+                )
 
+            if render_jobs:
+                def on_rendered(output_path):
+                    nonlocal current_render
                     current_render += 1
                     progress = (current_render / total_renders) * 100
                     context.window_manager.progress_update(progress)
-                    # Restore frame
-                    scene.frame_set(original_frame)
-                    image_id += 1
-                
-                camera_id += 1
 
-            write_model(cameras, images, {item.id: item for item in point3ds}, output_dir, self.output_format)
+                failed_renders = render_in_background(render_jobs, self.render_workers, on_rendered)
+                if failed_renders:
+                    self.report({'ERROR'}, f"{failed_renders} of {len(render_jobs)} background renders failed")
+                    return {'CANCELLED'}
+
+            points3D = Point3DSoA.concatenate([future.result() for future in point3d_futures])
+            write_model(cameras, images, points3D, output_dir, self.output_format)
         finally:
+            point_cloud_executor.shutdown(wait=True)
+            scene.frame_set(original_frame)
+            scene.camera = original_camera
+            scene.render.filepath = original_filepath
+            scene.render.use_file_extension = original_use_file_extension
+            self.restore_helper_modifiers(helper_states)
             self.restore_modifier_states(modifier_states)
 
         return {'FINISHED'}
 
-    def _downsample_and_save(self, img_path, output_dir, factor):
-        """Downsample a single image using Blender's API and save it."""
+    def _set_image_settings(self, render_settings, file_ext):
+        """Set the output format for saving files with file_ext.
+
+        Returns None when files keep their name, or the suffix to replace it
+        with; unknown formats are saved as PNG.
+        """
+        if file_ext in ['.jpg', '.jpeg']:
+            render_settings.file_format = 'JPEG'
+            render_settings.quality = 95
+            render_settings.color_mode = 'RGB'
+        elif file_ext == '.png':
+            render_settings.file_format = 'PNG'
+            render_settings.color_mode = 'RGBA'
+        elif file_ext in ['.tif', '.tiff']:
+            render_settings.file_format = 'TIFF'
+        elif file_ext == '.bmp':
+            render_settings.file_format = 'BMP'
+        else:
+            render_settings.file_format = 'PNG'
+            return '.png'
+        return None
+
+    def _downsample_and_save(self, img_path, output_path, factor):
+        """Downsample a single image using Blender's API and save it.
+
+        The scene's image settings must already match output_path's format.
+        """
+        if is_up_to_date(img_path, output_path):
+            return True
+
         image = None
         try:
             # Load image into Blender
@@ -305,40 +424,9 @@ class BlenderExporterForColmap(bpy.types.Operator, ExportHelper):
             new_height = image.size[1] // factor
             image.scale(new_width, new_height)
 
-            # Backup scene render settings
-            scene = bpy.context.scene
-            render_settings = scene.render.image_settings
-            original_format = render_settings.file_format
-            original_quality = render_settings.quality
-            original_color_mode = render_settings.color_mode
-
-            # Set output format based on original extension
-            output_path = output_dir / img_path.name
-            file_ext = img_path.suffix.lower()
-
-            if file_ext in ['.jpg', '.jpeg']:
-                render_settings.file_format = 'JPEG'
-                render_settings.quality = 95
-                render_settings.color_mode = 'RGB'
-            elif file_ext == '.png':
-                render_settings.file_format = 'PNG'
-                render_settings.color_mode = 'RGBA'
-            elif file_ext in ['.tif', '.tiff']:
-                render_settings.file_format = 'TIFF'
-            elif file_ext == '.bmp':
-                render_settings.file_format = 'BMP'
-            else:
-                render_settings.file_format = 'PNG'
-                output_path = output_path.with_suffix('.png')
-
             # Save the scaled image
             image.save_render(filepath=str(output_path))
 
-            # Restore render settings
-            render_settings.file_format = original_format
-            render_settings.quality = original_quality
-            render_settings.color_mode = original_color_mode
-
             bpy.data.images.remove(image)
             return True
         except Exception as e:
@@ -347,6 +435,42 @@ class BlenderExporterForColmap(bpy.types.Operator, ExportHelper):
                 bpy.data.images.remove(image)
             return False
 
+    def _downsample_with_blender(self, image_files, base_path, factors):
+        """Downsample all images for all factors with Blender's image API."""
+        # Backup scene render settings once for the whole batch
+        render_settings = bpy.context.scene.render.image_settings
+        original_format = render_settings.file_format
+        original_quality = render_settings.quality
+        original_color_mode = render_settings.color_mode
+
+        def suffix(path):
+            return path.suffix.lower()
+
+        try:
+            for factor in factors:
+                output_dir = base_path / f"images_{factor}"
+                output_dir.mkdir(exist_ok=True)
+                self.report({'INFO'}, f"Generating {len(image_files)} images for factor {factor} in {output_dir}...")
+
+                # Switch the output format once per extension, not per image.
+                # Each group starts from the original settings so quality and
+                # color_mode don't leak from the previous group.
+                for file_ext, group in groupby(sorted(image_files, key=suffix), key=suffix):
+                    render_settings.file_format = original_format
+                    render_settings.quality = original_quality
+                    render_settings.color_mode = original_color_mode
+                    output_ext = self._set_image_settings(render_settings, file_ext)
+                    for img_path in group:
+                        output_path = output_dir / img_path.name
+                        if output_ext is not None:
+                            output_path = output_path.with_suffix(output_ext)
+                        self._downsample_and_save(img_path, output_path, factor)
+        finally:
+            # Restore render settings
+            render_settings.file_format = original_format
+            render_settings.quality = original_quality
+            render_settings.color_mode = original_color_mode
+
     def run_downsampling(self, base_path):
         """Run the image downsampling process based on operator properties."""
         self.report({'INFO'}, "Starting image downsampling...")
@@ -362,25 +486,58 @@ class BlenderExporterForColmap(bpy.types.Operator, ExportHelper):
             self.report({'ERROR'}, "Invalid downsample factors. Use space-separated integers (e.g., '2 4 8').")
             return
 
-        extensions = ['*.jpg', '*.jpeg', '*.png', '*.tif', '*.tiff', '*.bmp']
-        image_files = []
-        for ext in extensions:
-            image_files.extend(glob.glob(str(images_dir / ext)))
-            image_files.extend(glob.glob(str(images_dir / ext.upper())))
+        extensions = ('.jpg', '.jpeg', '.png', '.tif', '.tiff', '.bmp')
+        # scandir reuses the directory entry's type, so no stat() per file
+        with os.scandir(images_dir) as entries:
+            image_files = sorted(
+                Path(entry.path) for entry in entries
+                if entry.is_file(follow_symlinks=False)
+                and entry.name.lower().endswith(extensions)
+            )
 
         if not image_files:
             self.report({'INFO'}, "No images found to downsample.")
             return
 
-        for factor in factors:
+        if HAS_PILLOW:
+            self._downsample_with_pillow(image_files, base_path, factors)
+        else:
+            self._downsample_with_blender(image_files, base_path, factors)
+
+        self.report({'INFO'}, "Image downsampling finished.")
+
+    def _downsample_with_pillow(self, image_files, base_path, factors):
+        """Downsample all images for all factors with Pillow on worker threads."""
+        output_dirs = {}
+        for factor in sorted(set(factors)):
+            if factor <= 1:
+                continue
             output_dir = base_path / f"images_{factor}"
             output_dir.mkdir(exist_ok=True)
             self.report({'INFO'}, f"Generating {len(image_files)} images for factor {factor} in {output_dir}...")
-            
-            for img_path_str in image_files:
-                self._downsample_and_save(Path(img_path_str), output_dir, factor)
-
-        self.report({'INFO'}, "Image downsampling finished.")
+            output_dirs[factor] = output_dir
+
+        # One job per image builds all of its stale levels as a cascade
+        jobs = []
+        for img_path in image_files:
+            outputs = {
+                factor: output_dir / img_path.name
+                for factor, output_dir in output_dirs.items()
+                if not is_up_to_date(img_path, output_dir / img_path.name)
+            }
+            if outputs:
+                jobs.append((img_path, outputs))
+
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            futures = {
+                executor.submit(downsample_pyramid, img_path, outputs): img_path
+                for img_path, outputs in jobs
+            }
+            for future, img_path in futures.items():
+                try:
+                    future.result()
+                except Exception as e:
+                    self.report({'ERROR'}, f"Error processing {img_path.name}: {e}")
 
     def execute(self, context):
         context.window_manager.progress_begin(0, 100)
@@ -407,6 +564,7 @@ class BlenderExporterForColmap(bpy.types.Operator, ExportHelper):
         layout.prop(self, "render_keyframes_only")
         layout.prop(self, "output_format")
         layout.prop(self, "camera_model")
+        layout.prop(self, "render_workers")
 
         box = layout.box()
         box.prop(self, "downsample_images")
@@ -0,0 +1,98 @@
+import bpy
+import json
+import os
+import queue
+import subprocess
+import tempfile
+import threading
+from pathlib import Path
+
+from .render_worker import RENDERED_PREFIX
+
+WORKER_SCRIPT = Path(__file__).with_name("render_worker.py")
+
+
+def _pump_output(process, rendered):
+    """Forward rendered image paths from a worker's stdout to a queue"""
+    try:
+        for line in process.stdout:
+            if line.startswith(RENDERED_PREFIX):
+                rendered.put(line[len(RENDERED_PREFIX):].strip())
+    finally:
+        # Always signal the end, or render_in_background waits forever
+        rendered.put(None)
+
+
+def render_in_background(jobs, num_workers, on_rendered):
+    """Render jobs in parallel background Blender processes.
+
+    jobs is a list of (camera_name, frame, output_path) tuples. The current
+    session is saved to a temporary copy so the workers see unsaved changes,
+    including the modifier states set up for the export. on_rendered is
+    called on the calling thread with each written path. Returns the number
+    of jobs that were not reported as rendered, counting every job of a
+    worker that exited with an error. The CPU cores are split between the
+    workers rather than each one rendering with all of them.
+    """
+    jobs = sorted(jobs, key=lambda job: job[1])
+    num_workers = max(1, min(num_workers, os.cpu_count() or 1, len(jobs)))
+    # Each worker would otherwise render with every core
+    threads_per_worker = max(1, (os.cpu_count() or 1) // num_workers)
+
+    with tempfile.TemporaryDirectory(prefix="colmap_prep_") as tmp_dir:
+        tmp_dir = Path(tmp_dir)
+        blend_path = tmp_dir / "scene.blend"
+        bpy.ops.wm.save_as_mainfile(filepath=str(blend_path), copy=True)
+
+        rendered = queue.Queue()
+        processes = []
+        try:
+            for worker_index in range(num_workers):
+                # Striding over frame-sorted jobs keeps each worker's list sorted
+                job_path = tmp_dir / f"jobs_{worker_index}.json"
+                job_path.write_text(json.dumps(
+                    [[name, int(frame), str(path)] for name, frame, path in jobs[worker_index::num_workers]]
+                ))
+                process = subprocess.Popen(
+                    [
+                        bpy.app.binary_path,
+                        "--background", str(blend_path),
+                        "--threads", str(threads_per_worker),
+                        # Without this Blender exits 0 even if the script raises
+                        "--python-exit-code", "1",
+                        "--python", str(WORKER_SCRIPT),
+                        "--", str(job_path),
+                    ],
+                    stdout=subprocess.PIPE,
+                    # Blender prints UTF-8 regardless of the locale
+                    encoding="utf-8",
+                    errors="replace",
+                )
+                processes.append(process)
+                threading.Thread(target=_pump_output, args=(process, rendered), daemon=True).start()
+        except BaseException:
+            # Don't leave workers running on (and holding open) the temporary
+            # copy that is about to be removed
+            for process in processes:
+                process.kill()
+                process.wait()
+            raise
+
+        finished = 0
+        rendered_paths = set()
+        while finished < len(processes):
+            output_path = rendered.get()
+            if output_path is None:
+                finished += 1
+            else:
+                rendered_paths.add(output_path)
+                on_rendered(output_path)
+
+        # A worker that raised or died mid-list may have written only some of
+        # its images, so distrust all of its jobs
+        failed_paths = set()
+        for worker_index, process in enumerate(processes):
+            if process.wait() != 0:
+                failed_paths.update(str(path) for _, _, path in jobs[worker_index::num_workers])
+        missing_paths = {str(path) for _, _, path in jobs} - rendered_paths
+        return len(missing_paths | failed_paths)
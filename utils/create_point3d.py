@@ -1,6 +1,6 @@
 import bpy
 import bmesh
-from .read_write_model import Point3D
+from .read_write_model import Point3DSoA
 import mathutils
 import os
 from pathlib import Path
@@ -8,15 +8,20 @@ import math
 import numpy as np
 
 
-def create_point3d_from_mesh(mesh_obj):
+def read_point_attributes(mesh_obj):
+    """Copy the evaluated point positions and colours of a mesh into arrays.
 
+    Touches bpy, so it must run on the main thread. Returns
+    ``(pos, col, matrix_world)`` with ``col`` None when the geometry has no
+    float colour attribute, or None when there is no position attribute.
+    """
     bpy.context.view_layer.objects.active = mesh_obj
     bpy.ops.object.mode_set(mode='OBJECT')
     
     depsgraph = bpy.context.evaluated_depsgraph_get()
     eval_obj = mesh_obj.evaluated_get(depsgraph)
     
-    point3ds = []
+    attributes = None
     # f.write("# 3D point list with one line of data per point:\n")
     # f.write("# POINT3D_ID, X, Y, Z, R, G, B, ERROR, TRACK[] as (IMAGE_ID, POINT2D_IDX)\n")
         
@@ -27,31 +32,49 @@ def create_point3d_from_mesh(mesh_obj):
             if attr.data_type == 'FLOAT_COLOR':
                 colour_attr = attr.data
                 break
-        
-        for i, pos_data in enumerate(position_attr, 1):
-            local_pos = pos_data.vector
-            world_co = mesh_obj.matrix_world @ local_pos
-            x, y, z = world_co.x, world_co.y, world_co.z
-            
-            if colour_attr and i-1 < len(colour_attr):
-                colour = colour_attr[i-1].color
-                r, g, b = int(colour[0] * 255), int(colour[1] * 255), int(colour[2] * 255)
-            else:
-                r, g, b = 128, 128, 128
-
-            p3d = Point3D(
-                    id=i,
-                    xyz=np.array([x, y, z]),
-                    rgb=np.array([r, g, b]),
-                    error=0,
-                    image_ids=np.array([]),
-                    point2D_idxs=np.array([]),
-            )
-            point3ds.append(p3d)
+
+        n = len(position_attr)
+        pos = np.empty(n * 3, dtype=np.float32)
+        position_attr.foreach_get('vector', pos)
+        pos = pos.reshape(n, 3)
+
+        col = None
+        if colour_attr:
+            m = len(colour_attr)
+            col = np.empty(m * 4, dtype=np.float32)
+            colour_attr.foreach_get('color', col)
+            col = col.reshape(m, 4)
+
+        matrix_world = np.array(mesh_obj.matrix_world, dtype=np.float32)
+        attributes = (pos, col, matrix_world)
     else:
         print("No 'position' attribute found in geometry data!")
     
     eval_obj.to_mesh_clear()
 
-    return point3ds
+    return attributes
+
+
+def build_point3d_soa(pos, col, matrix_world):
+    """Turn arrays from read_point_attributes into a world-space Point3DSoA.
+
+    Only uses NumPy, so it is safe to run off the main thread.
+    """
+    n = pos.shape[0]
+
+    # Transform all points to world space in one matmul
+    xyz = pos @ matrix_world[:3, :3].T
+    xyz += matrix_world[:3, 3]
+
+    rgb = np.full((n, 3), 128, dtype=np.uint8)
+    if col is not None:
+        k = min(n, col.shape[0])
+        # Clip so HDR or negative colours saturate instead of wrapping
+        rgb[:k] = np.clip(col[:k, :3] * 255.0, 0, 255).astype(np.uint8)
+
+    return Point3DSoA(
+        ids=np.arange(1, n + 1, dtype=np.uint64),
+        xyz=xyz,
+        rgb=rgb,
+    )
 
@@ -0,0 +1,47 @@
+from pathlib import Path
+
+# Pillow isn't bundled with Blender; without it the exporter falls back to
+# downsampling through Blender's image API.
+try:
+    from PIL import Image as PILImage
+except ImportError:
+    PILImage = None
+
+HAS_PILLOW = PILImage is not None
+
+
+def is_up_to_date(source: Path, target: Path):
+    """Whether target exists and is at least as new as source."""
+    return target.exists() and target.stat().st_mtime >= source.stat().st_mtime
+
+
+def _save(image, output_path: Path):
+    if output_path.suffix.lower() in ('.jpg', '.jpeg'):
+        # Skip the extra Huffman optimisation pass
+        image.save(output_path, quality=95, optimize=False)
+    else:
+        image.save(output_path)
+
+
+def downsample_pyramid(img_path: Path, outputs):
+    """Downsample an image file by several integer factors with Pillow.
+
+    outputs maps each factor to its output path. Levels are built as a
+    cascade: a factor that is a multiple of the previous one is resized from
+    that level instead of the full-size source, which gives the same sizes
+    as resizing the source directly. Runs without touching bpy, so it can be
+    called from worker threads; Pillow releases the GIL while decoding,
+    resizing and encoding.
+    """
+    with PILImage.open(img_path) as source:
+        source.load()
+        level, level_factor = source, 1
+        for factor in sorted(outputs):
+            if factor % level_factor != 0:
+                level, level_factor = source, 1
+            step = factor // level_factor
+            level = level.resize(
+                (level.width // step, level.height // step), PILImage.LANCZOS
+            )
+            level_factor = factor
+            _save(level, outputs[factor])
@@ -30,6 +30,7 @@
 
 import argparse
 import collections
+import collections.abc
 import os
 import struct
 
@@ -54,6 +55,88 @@ class Image(BaseImage):
         return qvec2rotmat(self.qvec)
 
 
+_EMPTY_TRACK = np.empty(0)
+
+# Layout of one points3D.bin record with an empty track:
+# POINT3D_ID (Q), XYZ (ddd), RGB (BBB), ERROR (d), TRACK_LENGTH (Q)
+POINT3D_BINARY_DTYPE = np.dtype(
+    [
+        ("id", "<u8"),
+        ("xyz", "<f8", (3,)),
+        ("rgb", "u1", (3,)),
+        ("error", "<f8"),
+        ("track_length", "<u8"),
+    ]
+)
+
+# IMAGE_ID, QW, QX, QY, QZ, TX, TY, TZ, CAMERA_ID of one images.bin record
+IMAGE_BINARY_HEADER = struct.Struct("<idddddddi")
+
+WRITE_BUFFER_SIZE = 1 << 20
+# Number of text lines joined into a single write() call.
+WRITE_BATCH_LINES = 10000
+
+
+class Point3DSoA(collections.abc.Mapping):
+    """Point cloud stored as parallel arrays instead of one Point3D per point.
+
+    Behaves like the ``{point3D_id: Point3D}`` dict used by the writers, but
+    only builds a Point3D when an item is accessed. ``ids`` must be sorted.
+    """
+
+    def __init__(self, ids, xyz, rgb):
+        self.ids = ids
+        self.xyz = xyz
+        self.rgb = rgb
+
+    @classmethod
+    def empty(cls):
+        return cls(
+            ids=np.empty(0, dtype=np.uint64),
+            xyz=np.empty((0, 3), dtype=np.float32),
+            rgb=np.empty((0, 3), dtype=np.uint8),
+        )
+
+    @classmethod
+    def concatenate(cls, parts):
+        """Merge several point clouds, renumbering ids from 1."""
+        if not parts:
+            return cls.empty()
+        if len(parts) == 1:
+            # Ids of a single cloud already start at 1; avoid copying it
+            return parts[0]
+        xyz = np.concatenate([part.xyz for part in parts])
+        rgb = np.concatenate([part.rgb for part in parts])
+        ids = np.arange(1, xyz.shape[0] + 1, dtype=np.uint64)
+        return cls(ids=ids, xyz=xyz, rgb=rgb)
+
+    def _point(self, idx):
+        return Point3D(
+            id=int(self.ids[idx]),
+            xyz=self.xyz[idx],
+            rgb=self.rgb[idx],
+            error=0,
+            image_ids=_EMPTY_TRACK,
+            point2D_idxs=_EMPTY_TRACK,
+        )
+
+    def __len__(self):
+        return self.ids.shape[0]
+
+    def __iter__(self):
+        return iter(self.ids.tolist())
+
+    def __getitem__(self, point3D_id):
+        idx = int(np.searchsorted(self.ids, point3D_id))
+        if idx == len(self) or self.ids[idx] != point3D_id:
+            raise KeyError(point3D_id)
+        return self._point(idx)
+
+    def items(self):
+        for idx in range(len(self)):
+            yield int(self.ids[idx]), self._point(idx)
+
+
 CAMERA_MODELS = {
     CameraModel(model_id=0, model_name="SIMPLE_PINHOLE", num_params=3),
     CameraModel(model_id=1, model_name="PINHOLE", num_params=4),
@@ -103,6 +186,18 @@ def write_next_bytes(fid, data, format_char_sequence, endian_character="<"):
     fid.write(bytes)
 
 
+def write_lines_batched(fid, lines):
+    """Write an iterable of newline-terminated strings in large chunks."""
+    batch = []
+    for line in lines:
+        batch.append(line)
+        if len(batch) == WRITE_BATCH_LINES:
+            fid.write("".join(batch))
+            batch.clear()
+    if batch:
+        fid.write("".join(batch))
+
+
 def read_cameras_text(path):
     """
     see: src/colmap/scene/reconstruction.cc
@@ -179,12 +274,17 @@ def write_cameras_text(cameras, path):
         + "#   CAMERA_ID, MODEL, WIDTH, HEIGHT, PARAMS[]\n"
         + "# Number of cameras: {}\n".format(len(cameras))
     )
-    with open(path, "w") as fid:
-        fid.write(HEADER)
+
+    def camera_lines():
         for _, cam in cameras.items():
             to_write = [cam.id, cam.model, cam.width, cam.height, *cam.params]
-            line = " ".join([str(elem) for elem in to_write])
-            fid.write(line + "\n")
+            yield " ".join([str(elem) for elem in to_write]) + "\n"
+
+    with open(
+        path, "w", buffering=WRITE_BUFFER_SIZE, newline="\n"
+    ) as fid:
+        fid.write(HEADER)
+        write_lines_batched(fid, camera_lines())
 
 
 def write_cameras_binary(cameras, path_to_model_file):
@@ -316,8 +416,7 @@ def write_images_text(images, path):
         )
     )
 
-    with open(path, "w") as fid:
-        fid.write(HEADER)
+    def image_lines():
         for _, img in images.items():
             image_header = [
                 img.id,
@@ -327,12 +426,17 @@ def write_images_text(images, path):
                 img.name,
             ]
             first_line = " ".join(map(str, image_header))
-            fid.write(first_line + "\n")
 
             points_strings = []
             for xy, point3D_id in zip(img.xys, img.point3D_ids):
                 points_strings.append(" ".join(map(str, [*xy, point3D_id])))
-            fid.write(" ".join(points_strings) + "\n")
+            yield first_line + "\n" + " ".join(points_strings) + "\n"
+
+    with open(
+        path, "w", buffering=WRITE_BUFFER_SIZE, newline="\n"
+    ) as fid:
+        fid.write(HEADER)
+        write_lines_batched(fid, image_lines())
 
 
 def write_images_binary(images, path_to_model_file):
@@ -341,7 +445,11 @@ def write_images_binary(images, path_to_model_file):
         void Reconstruction::ReadImagesBinary(const std::string& path)
         void Reconstruction::WriteImagesBinary(const std::string& path)
     """
-    with open(path_to_model_file, "wb") as fid:
+    if all(len(img.point3D_ids) == 0 for _, img in images.items()):
+        write_images_binary_without_points(images, path_to_model_file)
+        return
+
+    with open(path_to_model_file, "wb", buffering=WRITE_BUFFER_SIZE) as fid:
         write_next_bytes(fid, len(images), "Q")
         for _, img in images.items():
             write_next_bytes(fid, img.id, "i")
@@ -356,6 +464,24 @@ def write_images_binary(images, path_to_model_file):
                 write_next_bytes(fid, [*xy, p3d_id], "ddq")
 
 
+def write_images_binary_without_points(images, path_to_model_file):
+    """Write images.bin for images with no 2D points in a single block.
+
+    Same layout as write_images_binary; each record is packed with one
+    precompiled struct instead of one struct.pack call per field.
+    """
+    qvecs = np.array([img.qvec for _, img in images.items()], dtype=np.float64)
+    tvecs = np.array([img.tvec for _, img in images.items()], dtype=np.float64)
+    no_points2D = struct.pack("<Q", 0)
+    chunks = [struct.pack("<Q", len(images))]
+    for img, qvec, tvec in zip(images.values(), qvecs.tolist(), tvecs.tolist()):
+        chunks.append(IMAGE_BINARY_HEADER.pack(img.id, *qvec, *tvec, img.camera_id))
+        chunks.append(img.name.encode("utf-8") + b"\x00")
+        chunks.append(no_points2D)
+    with open(path_to_model_file, "wb", buffering=WRITE_BUFFER_SIZE) as fid:
+        fid.write(b"".join(chunks))
+
+
 def read_points3D_text(path):
     """
     see: src/colmap/scene/reconstruction.cc
@@ -446,15 +572,24 @@ def write_points3D_text(points3D, path):
         )
     )
 
-    with open(path, "w") as fid:
-        fid.write(HEADER)
+    def point_lines():
         for _, pt in points3D.items():
             point_header = [pt.id, *pt.xyz, *pt.rgb, pt.error]
-            fid.write(" ".join(map(str, point_header)) + " ")
             track_strings = []
             for image_id, point2D in zip(pt.image_ids, pt.point2D_idxs):
                 track_strings.append(" ".join(map(str, [image_id, point2D])))
-            fid.write(" ".join(track_strings) + "\n")
+            yield (
+                " ".join(map(str, point_header))
+                + " "
+                + " ".join(track_strings)
+                + "\n"
+            )
+
+    with open(
+        path, "w", buffering=WRITE_BUFFER_SIZE, newline="\n"
+    ) as fid:
+        fid.write(HEADER)
+        write_lines_batched(fid, point_lines())
 
 
 def write_points3D_binary(points3D, path_to_model_file):
@@ -463,7 +598,11 @@ def write_points3D_binary(points3D, path_to_model_file):
         void Reconstruction::ReadPoints3DBinary(const std::string& path)
         void Reconstruction::WritePoints3DBinary(const std::string& path)
     """
-    with open(path_to_model_file, "wb") as fid:
+    if isinstance(points3D, Point3DSoA):
+        write_points3D_binary_soa(points3D, path_to_model_file)
+        return
+
+    with open(path_to_model_file, "wb", buffering=WRITE_BUFFER_SIZE) as fid:
         write_next_bytes(fid, len(points3D), "Q")
         for _, pt in points3D.items():
             write_next_bytes(fid, pt.id, "Q")
@@ -476,6 +615,21 @@ def write_points3D_binary(points3D, path_to_model_file):
                 write_next_bytes(fid, [image_id, point2D_id], "ii")
 
 
+def write_points3D_binary_soa(points3D, path_to_model_file):
+    """Write a Point3DSoA to points3D.bin in a single block.
+
+    Same layout as write_points3D_binary, but the records are packed with
+    numpy instead of one struct.pack call per field. Tracks are empty.
+    """
+    records = np.zeros(len(points3D), dtype=POINT3D_BINARY_DTYPE)
+    records["id"] = points3D.ids
+    records["xyz"] = points3D.xyz
+    records["rgb"] = points3D.rgb
+    with open(path_to_model_file, "wb", buffering=WRITE_BUFFER_SIZE) as fid:
+        write_next_bytes(fid, len(points3D), "Q")
+        fid.write(records.tobytes())
+
+
 def detect_model_format(path, ext):
     if (
         os.path.isfile(os.path.join(path, "cameras" + ext))
@@ -564,6 +718,31 @@ def rotmat2qvec(R):
     return qvec
 
 
+def rotmats2qvecs(R):
+    """Vectorized rotmat2qvec for an (N, 3, 3) stack of rotation matrices.
+
+    Each quaternion is built from the largest of its four components to stay
+    numerically stable, and returned as [w, x, y, z] with w >= 0.
+    """
+    R = np.asarray(R, dtype=np.float64)
+    Rxx, Rxy, Rxz = R[:, 0, 0], R[:, 0, 1], R[:, 0, 2]
+    Ryx, Ryy, Ryz = R[:, 1, 0], R[:, 1, 1], R[:, 1, 2]
+    Rzx, Rzy, Rzz = R[:, 2, 0], R[:, 2, 1], R[:, 2, 2]
+    candidates = np.array(
+        [
+            [1 + Rxx + Ryy + Rzz, Rzy - Ryz, Rxz - Rzx, Ryx - Rxy],
+            [Rzy - Ryz, 1 + Rxx - Ryy - Rzz, Rxy + Ryx, Rxz + Rzx],
+            [Rxz - Rzx, Rxy + Ryx, 1 - Rxx + Ryy - Rzz, Ryz + Rzy],
+            [Ryx - Rxy, Rxz + Rzx, Ryz + Rzy, 1 - Rxx - Ryy + Rzz],
+        ]
+    )
+    best = np.argmax(candidates[[0, 1, 2, 3], [0, 1, 2, 3]], axis=0)
+    qvecs = candidates[best, :, np.arange(R.shape[0])]
+    qvecs /= np.linalg.norm(qvecs, axis=1, keepdims=True)
+    qvecs *= np.where(qvecs[:, :1] < 0, -1.0, 1.0)
+    return qvecs
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Read and write COLMAP binary and text models"
@@ -0,0 +1,38 @@
+"""Render script run by background Blender processes.
+
+Usage: blender --background scene.blend --python render_worker.py -- jobs.json
+
+jobs.json holds a list of [camera_name, frame, output_path] entries. A line
+starting with RENDERED_PREFIX is printed after each image is written so the
+parent process can report progress.
+"""
+import json
+import sys
+
+import bpy
+
+RENDERED_PREFIX = "COLMAP_PREP_RENDERED:"
+
+
+def main():
+    argv = sys.argv[sys.argv.index("--") + 1:]
+    with open(argv[0], "r") as f:
+        jobs = json.load(f)
+
+    scene = bpy.context.scene
+    # Write to exactly the path given by the parent
+    scene.render.use_file_extension = False
+
+    current_frame = None
+    for camera_name, frame, output_path in jobs:
+        if frame != current_frame:
+            scene.frame_set(frame)
+            current_frame = frame
+        scene.camera = bpy.data.objects[camera_name]
+        scene.render.filepath = output_path
+        bpy.ops.render.render(write_still=True)
+        print(RENDERED_PREFIX + output_path, flush=True)
+
+
+if __name__ == "__main__":
+    main()